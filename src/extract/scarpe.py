@@ -1,269 +1,521 @@
-import json
+import orjson
 import asyncio
-import random
+import codecs
+import io
 import time
-from httpx import AsyncClient, HTTPStatusError
-from parsel import Selector
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, asynccontextmanager
+from pathlib import Path
+from sys import intern
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import quote_plus, urlsplit, urlunsplit
+from lxml import etree
+from httpx import AsyncClient, HTTPStatusError, Limits
+from parsel import Selector, css2xpath
 from loguru import logger as log
 
 from ..constant import DATA_DIR
 
 
 # Constants for rate limiting
-REQUEST_DELAY_MIN = 1.0  # Minimum delay between requests (seconds)
-REQUEST_DELAY_MAX = 3.0  # Maximum delay between requests (seconds)
+REQUEST_RATE = 2.0  # Initial requests per second shared by all workers
+REQUEST_RATE_MIN = 0.2  # Floor for the request rate after repeated 429s
+REQUEST_RATE_MAX = 10.0  # Ceiling for the request rate while responses succeed
+REQUEST_RATE_STEP = 0.1  # Additive rate increase after each successful response
 MAX_RETRIES = 3  # Maximum number of retries for failed requests
 RETRY_DELAY_BASE = 2.0  # Base delay for exponential backoff
-
-
-async def delay_request():
-    """Add a random delay between requests to avoid rate limiting"""
-    delay = random.uniform(REQUEST_DELAY_MIN, REQUEST_DELAY_MAX)
-    await asyncio.sleep(delay)
+MAX_CONCURRENT = 5  # Maximum number of in-flight requests to the same host
+
+
+@dataclass(slots=True)
+class Post:
+    """A topic listed on a travel forum search results page"""
+    link: Optional[str]
+    title: Optional[str]
+    time: Optional[str]
+    forum: Optional[str]
+
+
+@dataclass(slots=True)
+class PostDetail:
+    """A scraped topic page with its replies"""
+    url: Optional[str]
+    title: Optional[str]
+    content: str
+    # Replies stay dicts: location and post_count are only present when shown
+    replies: List[Dict[str, str]]
+
+
+# CSS selectors translated to XPath once at import instead of on every page
+_TOPIC_XPATH = css2xpath('a.search-result.topic')
+_TOPIC_LINK_XPATH = css2xpath('::attr(href)')
+_TOPIC_TITLE_XPATH = css2xpath('h2::text')
+_TOPIC_METADATA_XPATH = css2xpath('p.metadata::text')
+
+# Detail pages are streamed with lxml iterparse, so the selectors used on
+# their elements are compiled into reusable XPath evaluators
+_CONTENT_XPATH = etree.XPath(css2xpath('.content.markdown'))
+_REPLY_AUTHOR_XPATH = etree.XPath(css2xpath('.author a::text'))
+_REPLY_TIME_XPATH = etree.XPath(css2xpath('time::attr(datetime)'))
+_REPLY_LOCATION_XPATH = etree.XPath(css2xpath('.user-location::text'))
+_REPLY_POST_COUNT_XPATH = etree.XPath(css2xpath('.post-count::text'))
+_TEXT_CONTENT_XPATH = etree.XPath('string()')
+_TEXT_NODES_XPATH = etree.XPath('text()')
+
+
+class AsyncTokenBucket:
+    """Token bucket rate limiter shared by all requests.
+
+    The refill rate adapts AIMD-style: it is halved on every 429 and grows
+    back additively on each successful response.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float, max_rate: float, step: float):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it"""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.step)
+
+    def on_rate_limited(self) -> None:
+        self.rate = max(self.min_rate, self.rate / 2)
+
+
+@dataclass(slots=True)
+class ScrapeSession:
+    """Resources shared by every request of one scraping run"""
+    # HTTP/2 client so every request reuses the same pooled connection
+    # instead of paying a fresh TCP+TLS handshake per page
+    client: AsyncClient
+    # HTML parsing is CPU-bound, so it runs in worker processes to keep the
+    # event loop free to drive in-flight requests
+    parse_pool: ProcessPoolExecutor
+    rate_limiter: AsyncTokenBucket
+
+
+@asynccontextmanager
+async def scrape_session() -> AsyncIterator[ScrapeSession]:
+    """Open the client, parse pool and rate limiter for a run, and close them when it ends"""
+    client = AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=Limits(max_connections=MAX_CONCURRENT, max_keepalive_connections=MAX_CONCURRENT, keepalive_expiry=60),
+    )
+    parse_pool = ProcessPoolExecutor()
+    try:
+        yield ScrapeSession(
+            client=client,
+            parse_pool=parse_pool,
+            rate_limiter=AsyncTokenBucket(
+                rate=REQUEST_RATE,
+                burst=MAX_CONCURRENT,
+                min_rate=REQUEST_RATE_MIN,
+                max_rate=REQUEST_RATE_MAX,
+                step=REQUEST_RATE_STEP,
+            ),
+        )
+    finally:
+        try:
+            await client.aclose()
+        finally:
+            parse_pool.shutdown(cancel_futures=True)
+
+
+def write_json(path: Path, data) -> None:
+    """Serialize data with orjson and write it to path as compact JSON"""
+    # The list file is only read back by this scraper, so skip indentation
+    path.write_bytes(orjson.dumps(data))
+
+
+async def run_parser(session: ScrapeSession, parser, html: Union[str, bytes], *args):
+    """Run an HTML parser in the session's process pool without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(session.parse_pool, parser, html, *args)
 
 
 # scrape travel forum list by keyword
 
-async def scrap_travel_forum_list_by_keyword(keyword: str, page: int = 1, retry_count: int = 0):
+async def scrap_travel_forum_list_by_keyword(session: ScrapeSession, keyword: str, page: int = 1, query: Optional[str] = None):
     """Scrape travel forum list with retry logic and rate limiting"""
-    try:
-        # Add delay before making request
-        await delay_request()
-        
-        async with AsyncClient(http2=True, timeout=30.0) as client:
+    # Callers scraping many pages pass the keyword pre-encoded as `query`
+    if query is None:
+        query = quote_plus(keyword)
+    
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            # Wait for the shared rate limiter before making request
+            await session.rate_limiter.acquire()
+            
             log.info(f"Scraping travel forum list by keyword: {keyword}, page: {page}")
-            response = await client.get(f"https://search.ricksteves.com/?button=&filter=Travel+Forum&page={page}&query={keyword.replace(' ', '+')}")
+            response = await session.client.get(f"https://search.ricksteves.com/?button=&filter=Travel+Forum&page={page}&query={query}")
             
             response.raise_for_status()
+            session.rate_limiter.on_success()
             return response.text
-            
-    except HTTPStatusError as e:
-        if e.response.status_code == 429 and retry_count < MAX_RETRIES:
-            # Exponential backoff for rate limiting
-            retry_delay = RETRY_DELAY_BASE ** (retry_count + 1)
-            log.warning(f"Rate limited (429) on page {page}. Retrying in {retry_delay} seconds... (attempt {retry_count + 1}/{MAX_RETRIES})")
-            await asyncio.sleep(retry_delay)
-            return await scrap_travel_forum_list_by_keyword(keyword, page, retry_count + 1)
-        else:
+                
+        except HTTPStatusError as e:
+            if e.response.status_code == 429:
+                # Slow down every worker, not just this one
+                session.rate_limiter.on_rate_limited()
+                if attempt < MAX_RETRIES:
+                    # Exponential backoff for rate limiting
+                    retry_delay = RETRY_DELAY_BASE ** (attempt + 1)
+                    log.warning(f"Rate limited (429) on page {page}. Retrying in {retry_delay} seconds... (attempt {attempt + 1}/{MAX_RETRIES})")
+                    await asyncio.sleep(retry_delay)
+                    continue
             log.error(f"HTTP error {e.response.status_code} on page {page}: {e}")
             raise
-    except Exception as e:
-        log.error(f"Unexpected error on page {page}: {e}")
-        raise
+        except Exception as e:
+            log.error(f"Unexpected error on page {page}: {e}")
+            raise
 
 
-def parse_travel_forum_list_by_keyword(html: str):
+def parse_travel_forum_list_by_keyword(html: str) -> List[Post]:
     selector = Selector(html)
     
     # Find all a tags with class "search-result topic"
-    topic_links = selector.css('a.search-result.topic')
+    topic_links = selector.xpath(_TOPIC_XPATH)
     
     scraped_data = []
     
     for link_element in topic_links:
         # Extract the href (link)
-        link = link_element.css('::attr(href)').get()
+        link = link_element.xpath(_TOPIC_LINK_XPATH).get()
         
         # Extract the title from the h2 element
-        title = link_element.css('h2::text').get()
+        title = link_element.xpath(_TOPIC_TITLE_XPATH).get()
         
         # Extract metadata from the p element with class "metadata"
-        metadata = link_element.css('p.metadata::text').get()
+        metadata = link_element.xpath(_TOPIC_METADATA_XPATH).get()
         
         # Clean up the data (remove extra whitespace)
         if title:
             title = title.strip()
         if metadata:
-            metadata = metadata.strip()
-            _ ,time, forum = metadata.split('|')
+            # Metadata looks like "<kind> | <time> | Posted in <forum>"
+            _, _, rest = metadata.partition('|')
+            time, _, forum = rest.partition('|')
             time = time.strip()
-            forum = forum.strip().replace("Posted in ", "")
+            forum = intern(forum.strip().removeprefix("Posted in "))
             
 
-        scraped_data.append({
-            'link': link,
-            'title': title,
-            'time': time,
-            'forum': forum
-        })
+        scraped_data.append(Post(link=link, title=title, time=time, forum=forum))
     
     return scraped_data
 
-async def get_travel_forum_list_by_keyword(keyword: str, start_page: int = 1, end_page: int = 276, max_concurrent: int = 5):
+async def get_travel_forum_list_by_keyword(
+    keyword: str,
+    start_page: int = 1,
+    end_page: int = 276,
+    max_concurrent: int = MAX_CONCURRENT,
+    session: Optional[ScrapeSession] = None,
+):
     """Complete function to scrape and parse travel forum data with concurrent processing and rate limiting"""
-    posts = []
+    if session is None:
+        async with scrape_session() as session:
+            return await get_travel_forum_list_by_keyword(keyword, start_page, end_page, max_concurrent, session)
+    
+    # Encode the keyword once for every page request and the output file name
+    query = quote_plus(keyword)
+    slug = keyword.replace(' ', '_')
+    
+    # Pages are handed out from a queue to a fixed pool of workers, so only
+    # max_concurrent coroutines exist regardless of how many pages there are
+    queue = asyncio.Queue()
+    for page in range(start_page, end_page + 1):
+        queue.put_nowait(page)
     
-    # Reduce max_concurrent to avoid overwhelming the server
-    semaphore = asyncio.Semaphore(max_concurrent)
+    page_results = {}
     
-    async def scrape_page(page):
-        async with semaphore:
+    async def worker():
+        while True:
+            page = await queue.get()
             try:
-                html = await scrap_travel_forum_list_by_keyword(keyword, page)
-                return parse_travel_forum_list_by_keyword(html)
+                html = await scrap_travel_forum_list_by_keyword(session, keyword, page, query)
+                page_results[page] = await run_parser(session, parse_travel_forum_list_by_keyword, html)
             except Exception as e:
                 log.error(f"Failed to scrape page {page}: {e}")
-                return []  # Return empty list for failed pages
+            finally:
+                queue.task_done()
     
-    # Create tasks for all pages
-    tasks = [scrape_page(page) for page in range(start_page, end_page + 1)]
-    
-    # Execute all tasks concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrent)]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
     
-    # Combine all results, handling exceptions
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            log.error(f"Task {i + start_page} failed: {result}")
-            continue
-        posts.extend(result)
+    # Combine results in page order; forum names come back from the parse
+    # pool as fresh copies, so intern them again in this process
+    posts = []
+    for page in sorted(page_results):
+        for post in page_results[page]:
+            if post.forum:
+                post.forum = intern(post.forum)
+            posts.append(post)
 
     log.info(f"Successfully scraped {len(posts)} posts")
-    with open(DATA_DIR / f"posts_{keyword.replace(' ', '_')}.json", "w") as f:
-        json.dump(posts, f, indent=2, ensure_ascii=False)
+    # Encode and write in a worker thread so the event loop is never blocked
+    await asyncio.to_thread(write_json, DATA_DIR / f"posts_{slug}.json", posts)
 
 
-async def scrape_post_detail(post_link: str, retry_count: int = 0) -> str:
-    """Scrape the HTML content of a post detail page with retry logic"""
-    try:
-        # Add delay before making request
-        await delay_request()
-        
-        async with AsyncClient(http2=True, timeout=30.0) as client:
+async def scrape_post_detail(session: ScrapeSession, post_link: str) -> Tuple[bytes, str]:
+    """Scrape the raw HTML bytes of a post detail page and their charset with retry logic"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            # Wait for the shared rate limiter before making request
+            await session.rate_limiter.acquire()
+            
             log.info(f"Scraping post detail: {post_link}")
-            response = await client.get(post_link)
+            response = await session.client.get(post_link)
             response.raise_for_status()
-            return response.text
-            
-    except HTTPStatusError as e:
-        if e.response.status_code == 429 and retry_count < MAX_RETRIES:
-            # Exponential backoff for rate limiting
-            retry_delay = RETRY_DELAY_BASE ** (retry_count + 1)
-            log.warning(f"Rate limited (429) for {post_link}. Retrying in {retry_delay} seconds... (attempt {retry_count + 1}/{MAX_RETRIES})")
-            await asyncio.sleep(retry_delay)
-            return await scrape_post_detail(post_link, retry_count + 1)
-        else:
+            session.rate_limiter.on_success()
+            # Hand the body to the parser undecoded, with the charset httpx
+            # would have decoded it with (Content-Type, else UTF-8)
+            return response.content, response.encoding
+                
+        except HTTPStatusError as e:
+            if e.response.status_code == 429:
+                # Slow down every worker, not just this one
+                session.rate_limiter.on_rate_limited()
+                if attempt < MAX_RETRIES:
+                    # Exponential backoff for rate limiting
+                    retry_delay = RETRY_DELAY_BASE ** (attempt + 1)
+                    log.warning(f"Rate limited (429) for {post_link}. Retrying in {retry_delay} seconds... (attempt {attempt + 1}/{MAX_RETRIES})")
+                    await asyncio.sleep(retry_delay)
+                    continue
             log.error(f"HTTP error {e.response.status_code} for {post_link}: {e}")
             raise
-    except Exception as e:
-        log.error(f"Unexpected error for {post_link}: {e}")
-        raise
+        except Exception as e:
+            log.error(f"Unexpected error for {post_link}: {e}")
+            raise
 
 
-def parse_post_detail(html: str) -> dict:
-    """Parse the HTML content and extract post details"""
-    selector = Selector(html)
+def _first(results: list) -> Optional[str]:
+    """Return the first XPath result as a plain string, like SelectorList.get()"""
+    return str(results[0]) if results else None
+
+
+def _has_class(element, name: str) -> bool:
+    """Check whether an element's class attribute contains the given class"""
+    return name in (element.get('class') or '').split()
+
+
+def _parse_reply(reply) -> dict:
+    """Extract author, time, content, location and post count from a reply article"""
+    reply_data = {}
     
-    # Extract URL (current page URL)
-    url = selector.css('meta[property="og:url"]::attr(content)').get()
-    if not url:
-        # Fallback: try to get from canonical link
-        url = selector.css('link[rel="canonical"]::attr(href)').get()
+    # Extract reply author
+    author = _first(_REPLY_AUTHOR_XPATH(reply))
+    if author:
+        reply_data['author'] = author.strip()
     
-    # Extract title
-    title = selector.css('h1.title::text').get()
-    if title:
-        title = title.strip()
+    # Extract reply time
+    time_element = _first(_REPLY_TIME_XPATH(reply))
+    if time_element:
+        reply_data['time'] = time_element
     
-    # Extract content (main post content)
-    content_element = selector.css('article.topic .content.markdown').get()
-    if content_element:
-        # Get text content without HTML tags
-        content = Selector(content_element).xpath('string()').get()
-        content = content.strip() if content else ""
+    # Extract reply content
+    reply_content_elements = _CONTENT_XPATH(reply)
+    if reply_content_elements:
+        reply_data['content'] = _TEXT_CONTENT_XPATH(reply_content_elements[0]).strip()
     else:
-        content = ""
+        reply_data['content'] = ""
     
-    # Extract replies
-    replies = []
-    reply_elements = selector.css('section#replies article.reply')
+    # Extract user location if available
+    location = _first(_REPLY_LOCATION_XPATH(reply))
+    if location:
+        reply_data['location'] = location.strip()
     
-    for reply in reply_elements:
-        reply_data = {}
-        
-        # Extract reply author
-        author = reply.css('.author a::text').get()
-        if author:
-            reply_data['author'] = author.strip()
-        
-        # Extract reply time
-        time_element = reply.css('time::attr(datetime)').get()
-        if time_element:
-            reply_data['time'] = time_element
-        
-        # Extract reply content
-        reply_content_element = reply.css('.content.markdown').get()
-        if reply_content_element:
-            reply_content = Selector(reply_content_element).xpath('string()').get()
-            reply_data['content'] = reply_content.strip() if reply_content else ""
-        else:
-            reply_data['content'] = ""
-        
-        # Extract user location if available
-        location = reply.css('.user-location::text').get()
-        if location:
-            reply_data['location'] = location.strip()
-        
-        # Extract post count if available
-        post_count = reply.css('.post-count::text').get()
-        if post_count:
-            reply_data['post_count'] = post_count.strip()
-        
-        replies.append(reply_data)
+    # Extract post count if available
+    post_count = _first(_REPLY_POST_COUNT_XPATH(reply))
+    if post_count:
+        reply_data['post_count'] = post_count.strip()
     
-    return {
-        'url': url,
-        'title': title,
-        'content': content,
-        'replies': replies
-    }
+    return reply_data
 
 
-async def get_post_detail(post_link: str) -> dict:
-    """Complete function to scrape and parse post detail data"""
-    html = await scrape_post_detail(post_link)
-    return parse_post_detail(html)
+def parse_post_detail(html: Union[str, bytes], encoding: str = 'utf-8') -> PostDetail:
+    """Parse the HTML content (text, or raw bytes in the given charset) and extract post details"""
+    if isinstance(html, str):
+        html = html.encode('utf-8')
+    elif codecs.lookup(encoding).name != 'utf-8':
+        # Transcode other charsets the way httpx decodes text, so the parser only sees UTF-8
+        html = html.decode(encoding, errors='replace').encode('utf-8')
+    
+    og_url = None
+    canonical_url = None
+    title = None
+    content = None
+    replies = []
+    
+    # Stream the page instead of building and querying the full DOM; each
+    # reply is extracted as soon as it closes and then dropped from the tree
+    events = etree.iterparse(
+        io.BytesIO(html),
+        events=('end',),
+        tag=('meta', 'link', 'h1', 'article'),
+        html=True,
+        encoding='utf-8',
+    )
+    for _, element in events:
+        tag = element.tag
+        if tag == 'meta':
+            # Extract URL (current page URL)
+            if og_url is None and element.get('property') == 'og:url':
+                og_url = element.get('content')
+        elif tag == 'link':
+            # Fallback: try to get from canonical link
+            if canonical_url is None and element.get('rel') == 'canonical':
+                canonical_url = element.get('href')
+        elif tag == 'h1':
+            # Extract title
+            if title is None and _has_class(element, 'title'):
+                title = _first(_TEXT_NODES_XPATH(element)) or ''
+        elif _has_class(element, 'reply') and any(
+            section.get('id') == 'replies' for section in element.iterancestors('section')
+        ):
+            replies.append(_parse_reply(element))
+            # Free the finished reply and any earlier siblings
+            element.clear(keep_tail=True)
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+        elif content is None and _has_class(element, 'topic'):
+            # Extract content (main post content)
+            content_elements = _CONTENT_XPATH(element)
+            if content_elements:
+                # Get text content without HTML tags
+                content = _TEXT_CONTENT_XPATH(content_elements[0]).strip()
+    
+    return PostDetail(
+        url=og_url or canonical_url,
+        title=title.strip() if title else None,
+        content=content or "",
+        replies=replies,
+    )
 
 
-async def process_all_post_details(posts: list, max_concurrent: int = 5) -> list:
-    """Process all post details concurrently with rate limiting"""
-    semaphore = asyncio.Semaphore(max_concurrent)
+async def get_post_detail(session: ScrapeSession, post_link: str) -> PostDetail:
+    """Complete function to scrape and parse post detail data"""
+    html, encoding = await scrape_post_detail(session, post_link)
+    return await run_parser(session, parse_post_detail, html, encoding)
+
+
+def normalize_link(link: str) -> str:
+    """Strip the query string and fragment from a post link and lowercase its host"""
+    parts = urlsplit(link)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, '', ''))
+
+
+def load_scraped_links(path: Path) -> Set[str]:
+    """Load the links recorded as scraped by earlier runs"""
+    if not path.exists():
+        return set()
+    with open(path, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def dedupe_posts(posts: Iterable[dict], seen: Set[str]) -> List[dict]:
+    """Normalize post links and drop posts whose link is already in seen"""
+    unique = []
+    for post in posts:
+        link = normalize_link(post["link"])
+        if link not in seen:
+            seen.add(link)
+            unique.append({**post, "link": link})
+    return unique
+
+
+async def process_all_post_details(
+    posts: Iterable[dict],
+    output_path: Path,
+    max_concurrent: int = MAX_CONCURRENT,
+    scraped_links_path: Optional[Path] = None,
+    session: Optional[ScrapeSession] = None,
+) -> int:
+    """Process post details with a bounded worker pool and append each result to a JSONL file"""
+    if session is None:
+        async with scrape_session() as session:
+            return await process_all_post_details(posts, output_path, max_concurrent, scraped_links_path, session)
+    
+    # Posts are fed through a bounded queue so only the in-flight window is
+    # materialized as pending work, however many posts the iterable yields
+    queue = asyncio.Queue(maxsize=max_concurrent * 2)
+    total = 0
+    processed = 0
     
-    async def process_single_post(post):
-        async with semaphore:
+    async def worker(f, links_file):
+        nonlocal processed
+        while True:
+            post = await queue.get()
             try:
-                return await get_post_detail(post["link"])
+                result = await get_post_detail(session, post["link"])
+                f.write(orjson.dumps(result) + b"\n")
+                if links_file is not None:
+                    links_file.write(post["link"] + "\n")
+                processed += 1
             except Exception as e:
                 log.error(f"Failed to process post {post.get('link', 'unknown')}: {e}")
-                return None  # Return None for failed posts
+            finally:
+                queue.task_done()
     
-    # Create tasks for all posts
-    tasks = [process_single_post(post) for post in posts]
-    
-    # Execute all tasks concurrently
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Filter out None results and exceptions
-    valid_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            log.error(f"Task {i} failed: {result}")
-            continue
-        if result is not None:
-            valid_results.append(result)
+    with ExitStack() as stack:
+        f = stack.enter_context(open(output_path, "ab"))
+        links_file = None
+        if scraped_links_path is not None:
+            links_file = stack.enter_context(open(scraped_links_path, "a", encoding="utf-8"))
+        
+        workers = [asyncio.create_task(worker(f, links_file)) for _ in range(max_concurrent)]
+        try:
+            for post in posts:
+                await queue.put(post)
+                total += 1
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
     
-    log.info(f"Successfully processed {len(valid_results)} out of {len(posts)} posts")
-    return valid_results
+    log.info(f"Successfully processed {processed} out of {total} posts")
+    return processed
 
 
 async def main():
-    with open(DATA_DIR / "posts_audio_guide.json", "r") as f:
-        posts = json.load(f)
-
-    posts_detail = await process_all_post_details(posts)
-
-    with open(DATA_DIR / "posts_audio_guide_detail.json", "w") as f:
-        json.dump(posts_detail, f, indent=2, ensure_ascii=False)
+    with open(DATA_DIR / "posts_audio_guide.json", "rb") as f:
+        posts = orjson.loads(f.read())
+
+    # Skip duplicate links and anything scraped by an earlier run, so an
+    # interrupted crawl resumes where it stopped
+    scraped_links_path = DATA_DIR / "posts_audio_guide_detail.links"
+    posts = dedupe_posts(posts, load_scraped_links(scraped_links_path))
+
+    async with scrape_session() as session:
+        await process_all_post_details(
+            posts,
+            DATA_DIR / "posts_audio_guide_detail.jsonl",
+            scraped_links_path=scraped_links_path,
+            session=session,
+        )
 
 
 
@@ -5,19 +5,26 @@ This Streamlit application provides interactive visualization of Rick Steves for
 audio guide analysis data, including sentiment analysis, theme distribution, and forum metrics.
 """
 
+from __future__ import annotations
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import json
-import sys
+import functools
+import heapq
+import re
+from collections import Counter
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Any
 import numpy as np
+from .json_compat import JSONDecodeError, load_path
 from .reactions_loader import ReactionsLoader
 
-# Add this helper function
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# Add this helper function; the answer can't change within a process, so compute it once
+@functools.lru_cache(maxsize=1)
 def is_running_in_streamlit():
     try:
         import streamlit.runtime.scriptrunner.script_run_context as stc
@@ -25,6 +32,138 @@ def is_running_in_streamlit():
     except Exception:
         return False
 
+@st.cache_data(show_spinner=False)
+def _sentiment_fig(positive: int, negative: int, neutral: int, museum: str) -> go.Figure:
+    """Build the sentiment distribution pie for one museum."""
+    import plotly.express as px
+    
+    sentiment_data = {
+        'Sentiment': ['Positive', 'Negative', 'Neutral'],
+        'Count': [positive, negative, neutral]
+    }
+    
+    df = pd.DataFrame(sentiment_data)
+    
+    return px.pie(
+        df,
+        values='Count',
+        names='Sentiment',
+        title=f"Audio Guide Sentiment Distribution - {museum}",
+        color_discrete_map={
+            'Positive': '#2E8B57',
+            'Negative': '#DC143C',
+            'Neutral': '#FFD700'
+        }
+    )
+
+@st.cache_data(show_spinner=False)
+def _engagement_fig(top_users: tuple, museum: str) -> go.Figure:
+    """Build the top-users engagement bar chart for one museum."""
+    import plotly.express as px
+    
+    df = pd.DataFrame(list(top_users), columns=['User', 'Posts'])
+    
+    fig = px.bar(
+        df,
+        x='User',
+        y='Posts',
+        title=f"Top Users by Engagement - {museum}",
+        color='Posts',
+        color_continuous_scale='viridis'
+    )
+    
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _themes_fig(themes: tuple, museum: str) -> go.Figure:
+    """Build the common themes bar chart for one museum."""
+    import plotly.express as px
+    
+    # Count theme occurrences, keeping the 30 most common
+    df = pd.DataFrame(Counter(themes).most_common(30), columns=['Theme', 'Count'])
+    
+    fig = px.bar(
+        df,
+        x='Theme',
+        y='Count',
+        title=f"Common Themes - {museum}",
+        color='Count',
+        color_continuous_scale='plasma'
+    )
+    
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def _get_reactions_loader(reactions_dir: str) -> ReactionsLoader:
+    """Parse the reactions markdown once per directory and share it across reruns."""
+    return ReactionsLoader(reactions_dir)
+
+# Sentiment categories, in code order
+SENTIMENT_LABELS = ['positive', 'negative', 'neutral']
+
+# Post fields kept column-wise for filtering and summaries
+POST_COLUMNS = ['title', 'content', 'sentiment', 'sentiment_score', 'audio_guide_mention', 'url']
+
+# Narrow dtypes for the per-museum count columns of the metrics frame
+METRIC_COUNT_DTYPES = {
+    'total_posts': 'int32',
+    'total_replies': 'int32',
+    'positive_reactions': 'int32',
+    'negative_reactions': 'int32',
+    'neutral_reactions': 'int32',
+    'total_reactions': 'int32'
+}
+
+# Museum comparison panels, in row-major subplot order
+COMPARISON_METRICS = {
+    'total_posts': 'Total Posts',
+    'audio_guide_sentiment_score': 'Sentiment Score',
+    'total_replies': 'Total Replies',
+    'total_reactions': 'Total Reactions'
+}
+
+@st.cache_data(show_spinner=False)
+def _museum_comparison_fig(df: pd.DataFrame) -> go.Figure:
+    """Build the faceted museum comparison figure, cached per metrics frame."""
+    import plotly.express as px
+    
+    long_df = df.melt(id_vars='museum', value_vars=list(COMPARISON_METRICS), var_name='metric')
+    
+    fig = px.bar(
+        long_df,
+        x='museum',
+        y='value',
+        facet_col='metric',
+        facet_col_wrap=2,
+        category_orders={'metric': list(COMPARISON_METRICS)}
+    )
+    fig.for_each_annotation(lambda a: a.update(text=COMPARISON_METRICS[a.text.split('=', 1)[-1]]))
+    fig.update_yaxes(matches=None, showticklabels=True, title_text='')
+    fig.update_xaxes(showticklabels=True, title_text='')
+    fig.update_layout(
+        height=600,
+        title_text="Museum Comparison Metrics",
+        showlegend=False
+    )
+    return fig
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=600)
+def _filter_post_positions(_dashboard: RickStevesDashboard, posts_path: str, posts_mtime: float, museum_name: str,
+                           audio_only: bool, sentiment_filter: str, min_sentiment: float, search_term: str) -> np.ndarray:
+    """Filter a museum's posts, cached per posts file version and filter values."""
+    return _dashboard.filter_museum_posts(museum_name, audio_only, sentiment_filter, min_sentiment, search_term)
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_dashboard(metrics_path: str, comparison_path: str, enhanced_posts_path: str, reactions_dir: str = ".",
+                  data_mtimes: tuple[float | None, ...] = ()) -> RickStevesDashboard:
+    """Build the dashboard once and share it across Streamlit reruns.
+    
+    data_mtimes only keys the cache, so regenerated data files rebuild the dashboard.
+    """
+    return RickStevesDashboard(metrics_path, comparison_path, enhanced_posts_path, reactions_dir)
+
 class RickStevesDashboard:
     """Main dashboard class for Rick Steves audio guide analysis."""
     
@@ -50,35 +189,33 @@ class RickStevesDashboard:
             "프라도 미술관": "Museo del Prado"
         }
         
-        # Get all available museum names
-        all_museums = self.get_museum_names()
+        # Lowercase every name once and reuse it for both classifications
+        lowered = [(museum, museum.lower()) for museum in self.get_museum_names()]
+        major_needles = [
+            # Special handling for Prado Museum
+            (korean_name, ("prado",) if korean_name == "프라도 미술관" else (english_name.lower(), korean_name.lower()))
+            for korean_name, english_name in self.major_museums.items()
+        ]
+        # One alternation scan per museum instead of a substring test per major name
+        self._major_re = re.compile('|'.join(re.escape(name.lower()) for name in self.major_museums.values()))
         
         # Separate major museums and others
-        self.available_major_museums = {}
+        matches = {}
         self.other_museums = []
         
-        for korean_name, english_name in self.major_museums.items():
-            # Check if this museum exists in our data
-            for museum in all_museums:
-                # Special handling for Prado Museum
-                if korean_name == "프라도 미술관":
-                    if "prado" in museum.lower():
-                        self.available_major_museums[korean_name] = museum
-                        break
-                elif english_name.lower() in museum.lower() or korean_name.lower() in museum.lower():
-                    self.available_major_museums[korean_name] = museum
-                    break
-        
-        # Get other museums (not in major list)
-        major_english_names = [name.lower() for name in self.major_museums.values()]
-        for museum in all_museums:
-            is_major = False
-            for major_name in major_english_names:
-                if major_name in museum.lower():
-                    is_major = True
-                    break
-            if not is_major:
+        for museum, museum_lower in lowered:
+            for korean_name, needles in major_needles:
+                if korean_name not in matches and any(needle in museum_lower for needle in needles):
+                    matches[korean_name] = museum
+            if not self._major_re.search(museum_lower):
                 self.other_museums.append(museum)
+        
+        # Keep the major museums in their declared order
+        self.available_major_museums = {
+            korean_name: matches[korean_name]
+            for korean_name in self.major_museums
+            if korean_name in matches
+        }
     
     def load_data(self) -> None:
         """Load metrics, comparison, and enhanced posts data from JSON files."""
@@ -95,14 +232,46 @@ class RickStevesDashboard:
             if not self.enhanced_posts_path.exists():
                 raise FileNotFoundError(f"Enhanced posts file not found: {self.enhanced_posts_path}")
             
-            with open(self.metrics_path, 'r', encoding='utf-8') as f:
-                self.metrics_data = json.load(f)
+            self.metrics_data = load_path(self.metrics_path)
+            # Total reactions are read by several views; add them to each record once
+            for museum in self.metrics_data:
+                museum['total_reactions'] = museum['positive_reactions'] + museum['negative_reactions'] + museum['neutral_reactions']
+            self._museum_by_name = {museum['museum']: museum for museum in self.metrics_data}
+            self._museum_names = list(self._museum_by_name)
+            self.comparison_data = load_path(self.comparison_path)
+            self.enhanced_posts_mtime = self.enhanced_posts_path.stat().st_mtime
+            self.enhanced_posts_data = load_path(self.enhanced_posts_path)
             
-            with open(self.comparison_path, 'r', encoding='utf-8') as f:
-                self.comparison_data = json.load(f)
+            # Build the frames shared by the comparison and insights views once
+            self.metrics_df = pd.DataFrame(self.metrics_data)
+            if not self.metrics_df.empty:
+                # Counts fit comfortably in 32 bits
+                self.metrics_df = self.metrics_df.astype(METRIC_COUNT_DTYPES)
+            comparison = self.comparison_data or {}
+            self.top_engagement_df = pd.DataFrame(comparison.get('top_museums_by_engagement', []))
+            if not self.top_engagement_df.empty:
+                self.top_engagement_df = self.top_engagement_df.astype(
+                    {'total_posts': 'int32', 'total_replies': 'int32', 'total_engagement': 'int32'}
+                )
+            self.top_sentiment_df = pd.DataFrame(comparison.get('top_museums_by_sentiment', []))
+            self.theme_distribution_df = pd.DataFrame(
+                list(comparison.get('theme_distribution', {}).items()),
+                columns=['Theme', 'Count']
+            ).astype({'Count': 'int32'})
             
-            with open(self.enhanced_posts_path, 'r', encoding='utf-8') as f:
-                self.enhanced_posts_data = json.load(f)
+            # Keep post fields column-wise, with lowercased text for museum and search lookups
+            self.posts_df = pd.DataFrame(self.enhanced_posts_data, columns=POST_COLUMNS)
+            # Title and content joined by a separator no query contains, so one scan covers both
+            self.posts_df['search_lower'] = (
+                self.posts_df['title'].fillna('') + '\x01' + self.posts_df['content'].fillna('')
+            ).str.lower()
+            self._sentiment_scores = self.posts_df['sentiment_score'].fillna(0).to_numpy(dtype=np.float64)
+            # Sentiment labels as a categorical, so label filters compare int8 codes
+            self.posts_df['sentiment'] = self.posts_df['sentiment'].astype(pd.CategoricalDtype(SENTIMENT_LABELS))
+            self._sentiment_codes = self.posts_df['sentiment'].cat.codes.to_numpy()
+            self._audio_mentions = self.posts_df['audio_guide_mention'].fillna(False).to_numpy(dtype=bool)
+            self._museum_post_index = {}
+            self._museum_posts = {}
                 
             # Debug: Print data summary
             if is_running_in_streamlit():
@@ -115,7 +284,7 @@ class RickStevesDashboard:
                 st.stop()
             else:
                 raise
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             if is_running_in_streamlit():
                 st.error(f"Invalid JSON data: {e}")
                 st.stop()
@@ -131,7 +300,7 @@ class RickStevesDashboard:
     def load_reactions(self) -> None:
         """Load reactions data from markdown files."""
         try:
-            self.reactions_loader = ReactionsLoader(self.reactions_dir)
+            self.reactions_loader = _get_reactions_loader(self.reactions_dir)
             if is_running_in_streamlit():
                 st.success(f"Loaded reactions for {len(self.reactions_loader.get_museums_with_reactions())} museums")
         except Exception as e:
@@ -141,94 +310,82 @@ class RickStevesDashboard:
                 print(f"Could not load reactions data: {e}")
             self.reactions_loader = None
     
-    def get_museum_names(self) -> List[str]:
+    def get_museum_names(self) -> list[str]:
         """Get list of available museum names."""
         if not self.metrics_data:
             return []
-        return [museum['museum'] for museum in self.metrics_data]
+        return self._museum_names
     
-    def get_museum_data(self, museum_name: str) -> Optional[Dict[str, Any]]:
+    def get_museum_data(self, museum_name: str) -> dict[str, Any] | None:
         """Get data for a specific museum."""
         if not self.metrics_data:
             return None
         
-        for museum in self.metrics_data:
-            if museum['museum'] == museum_name:
-                return museum
-        return None
+        return self._museum_by_name.get(museum_name)
     
-    def get_museum_posts(self, museum_name: str) -> List[Dict[str, Any]]:
+    def get_museum_posts(self, museum_name: str) -> list[dict[str, Any]]:
         """Get posts for a specific museum."""
         if not self.enhanced_posts_data:
             return []
         
-        # Filter posts by museum name (case-insensitive)
-        museum_posts = []
-        for post in self.enhanced_posts_data:
-            title = post.get('title', '') or ''
-            content = post.get('content', '') or ''
-            if museum_name.lower() in title.lower() or \
-               museum_name.lower() in content.lower():
-                museum_posts.append(post)
-        return museum_posts
-    
-    def create_overview_metrics(self, museum_data: Dict[str, Any]) -> None:
-        """Display overview metrics for selected museum."""
-        col1, col2, col3, col4 = st.columns(4)
+        # Memoized per name; the posts never change for the lifetime of the dashboard
+        posts = self._museum_posts.get(museum_name)
+        if posts is None:
+            posts = [self.enhanced_posts_data[i] for i in self.get_museum_post_indices(museum_name)]
+            self._museum_posts[museum_name] = posts
+        return posts
+    
+    def get_museum_post_indices(self, museum_name: str) -> np.ndarray:
+        """Get positions of a museum's posts, matched case-insensitively and cached per name."""
+        indices = self._museum_post_index.get(museum_name)
+        if indices is None:
+            name_lc = museum_name.lower()
+            mask = self.posts_df['search_lower'].str.contains(name_lc, regex=False)
+            indices = np.flatnonzero(mask.to_numpy())
+            self._museum_post_index[museum_name] = indices
+        return indices
+    
+    def filter_museum_posts(self, museum_name: str, audio_only: bool, sentiment_filter: str,
+                            min_sentiment: float, search_term: str) -> np.ndarray:
+        """Get positions within a museum's posts that pass the Posts tab filters."""
+        post_indices = self.get_museum_post_indices(museum_name)
         
-        with col1:
-            st.metric(
-                label="Total Posts",
-                value=museum_data['total_posts']
-            )
+        # Apply filters as one combined boolean mask
+        mask = self._sentiment_scores[post_indices] >= min_sentiment
+        if audio_only:
+            mask &= self._audio_mentions[post_indices]
         
-        with col2:
-            st.metric(
-                label="Total Replies",
-                value=museum_data['total_replies']
-            )
+        if sentiment_filter != "All":
+            mask &= self._sentiment_codes[post_indices] == SENTIMENT_LABELS.index(sentiment_filter.lower())
         
-        with col3:
-            total_reactions = museum_data['positive_reactions'] + museum_data['negative_reactions'] + museum_data['neutral_reactions']
-            st.metric(
-                label="Total Reactions",
-                value=total_reactions
-            )
+        # Apply text search filter
+        if search_term:
+            mask &= self.posts_df['search_lower'].iloc[post_indices].str.contains(search_term, regex=False).to_numpy()
         
-        with col4:
-            st.metric(
-                label="Sentiment Score",
-                value=f"{museum_data['audio_guide_sentiment_score']:.3f}"
-            )
+        return np.flatnonzero(mask)
+    
+    def create_overview_metrics(self, museum_data: dict[str, Any]) -> None:
+        """Display overview metrics for selected museum."""
+        metrics = [
+            ("Total Posts", museum_data['total_posts']),
+            ("Total Replies", museum_data['total_replies']),
+            ("Total Reactions", museum_data['total_reactions']),
+            ("Sentiment Score", f"{museum_data['audio_guide_sentiment_score']:.3f}")
+        ]
+        for col, (label, value) in zip(st.columns(4), metrics):
+            col.metric(label=label, value=value)
     
-    def create_sentiment_chart(self, museum_data: Dict[str, Any]) -> None:
+    def create_sentiment_chart(self, museum_data: dict[str, Any]) -> None:
         """Create sentiment distribution chart."""
-        sentiment_data = {
-            'Sentiment': ['Positive', 'Negative', 'Neutral'],
-            'Count': [
-                museum_data['positive_reactions'],
-                museum_data['negative_reactions'],
-                museum_data['neutral_reactions']
-            ]
-        }
-        
-        df = pd.DataFrame(sentiment_data)
-        
-        fig = px.pie(
-            df,
-            values='Count',
-            names='Sentiment',
-            title=f"Audio Guide Sentiment Distribution - {museum_data['museum']}",
-            color_discrete_map={
-                'Positive': '#2E8B57',
-                'Negative': '#DC143C',
-                'Neutral': '#FFD700'
-            }
+        fig = _sentiment_fig(
+            museum_data['positive_reactions'],
+            museum_data['negative_reactions'],
+            museum_data['neutral_reactions'],
+            museum_data['museum']
         )
-        
         st.plotly_chart(fig, use_container_width=True)
     
-    def create_engagement_chart(self, museum_data: Dict[str, Any]) -> None:
+    def create_engagement_chart(self, museum_data: dict[str, Any]) -> None:
         """Create user engagement chart."""
         user_engagement = museum_data.get('user_engagement', {})
         
@@ -237,23 +394,12 @@ class RickStevesDashboard:
             return
         
         # Get top 10 users by engagement
-        top_users = sorted(user_engagement.items(), key=lambda x: x[1], reverse=True)[:10]
-        
-        df = pd.DataFrame(top_users, columns=['User', 'Posts'])
+        top_users = heapq.nlargest(10, user_engagement.items(), key=itemgetter(1))
         
-        fig = px.bar(
-            df,
-            x='User',
-            y='Posts',
-            title=f"Top Users by Engagement - {museum_data['museum']}",
-            color='Posts',
-            color_continuous_scale='viridis'
-        )
-        
-        fig.update_layout(xaxis_tickangle=-45)
+        fig = _engagement_fig(tuple(top_users), museum_data['museum'])
         st.plotly_chart(fig, use_container_width=True)
     
-    def create_themes_chart(self, museum_data: Dict[str, Any]) -> None:
+    def create_themes_chart(self, museum_data: dict[str, Any]) -> None:
         """Create common themes chart."""
         themes = museum_data.get('common_themes', [])
         
@@ -261,26 +407,7 @@ class RickStevesDashboard:
             st.info("No common themes data available for this museum.")
             return
         
-        # Count theme occurrences
-        theme_counts = {}
-        for theme in themes:
-            theme_counts[theme] = theme_counts.get(theme, 0) + 1
-        
-        df = pd.DataFrame([
-            {'Theme': k, 'Count': v} 
-            for k, v in theme_counts.items()
-        ])
-        
-        fig = px.bar(
-            df,
-            x='Theme',
-            y='Count',
-            title=f"Common Themes - {museum_data['museum']}",
-            color='Count',
-            color_continuous_scale='plasma'
-        )
-        
-        fig.update_layout(xaxis_tickangle=-45)
+        fig = _themes_fig(tuple(themes), museum_data['museum'])
         st.plotly_chart(fig, use_container_width=True)
     
     def create_museum_comparison(self) -> None:
@@ -288,120 +415,77 @@ class RickStevesDashboard:
         if not self.metrics_data:
             return
         
-        df = pd.DataFrame(self.metrics_data)
-        
-        # Create subplots for different metrics
-        fig = make_subplots(
-            rows=2, cols=2,
-            subplot_titles=('Total Posts', 'Sentiment Score', 'Total Replies', 'Total Reactions'),
-            specs=[[{"type": "bar"}, {"type": "bar"}],
-                   [{"type": "bar"}, {"type": "bar"}]]
-        )
-        
-        # Total Posts
-        fig.add_trace(
-            go.Bar(x=df['museum'], y=df['total_posts'], name='Total Posts'),
-            row=1, col=1
-        )
-        
-        # Sentiment Score
-        fig.add_trace(
-            go.Bar(x=df['museum'], y=df['audio_guide_sentiment_score'], name='Sentiment Score'),
-            row=1, col=2
-        )
-        
-        # Total Replies
-        fig.add_trace(
-            go.Bar(x=df['museum'], y=df['total_replies'], name='Total Replies'),
-            row=2, col=1
-        )
-        
-        # Total Reactions
-        total_reactions = df['positive_reactions'] + df['negative_reactions'] + df['neutral_reactions']
-        fig.add_trace(
-            go.Bar(x=df['museum'], y=total_reactions, name='Total Reactions'),
-            row=2, col=2
-        )
-        
-        fig.update_layout(
-            height=600,
-            title_text="Museum Comparison Metrics",
-            showlegend=False
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        # Only the plotted columns, so the cache can hash the frame without pickling its list/dict columns
+        fig = _museum_comparison_fig(self.metrics_df[['museum', *COMPARISON_METRICS]])
+        # A stable key lets the frontend update the existing chart in place instead of re-creating it
+        st.plotly_chart(fig, use_container_width=True, key="museum_comparison")
     
-    def create_posts_table(self, posts: List[Dict[str, Any]], text_search: str = "") -> None:
+    def create_posts_table(self, posts: list[dict[str, Any]], text_search: str = "") -> None:
         """Display posts in a table format."""
         if not posts:
             st.info("No posts available for this museum.")
             return
         
-        # Prepare data for table
-        table_data = []
-        for post in posts:
-            table_data.append({
-                'Title': post.get('title', 'No Title'),
-                'Sentiment': post.get('sentiment', 'neutral'),
-                'Sentiment Score': f"{post.get('sentiment_score', 0):.3f}",
-                'Audio Guide Mention': 'Yes' if post.get('audio_guide_mention') else 'No',
-                'URL': post.get('url', 'No URL'),
-                'Content': post.get('content', 'No content available')
-            })
-        
-        df = pd.DataFrame(table_data)
-        
-        # Display the table with post content in a more user-friendly way
+        # Display one selectable table; only the selected post is expanded
         st.markdown("### 📝 Individual Posts")
-        st.markdown("Click on any post to view the full details.")
+        st.markdown("Select a post in the table to view the full details.")
+        # Build the compact view column-wise straight from the posts, without the content column
+        compact_df = pd.DataFrame({
+            'Title': [post.get('title', 'No Title') for post in posts],
+            'Sentiment': [post.get('sentiment', 'neutral') for post in posts],
+            'Sentiment Score': [f"{post.get('sentiment_score', 0):.3f}" for post in posts],
+            'Audio Guide Mention': ['Yes' if post.get('audio_guide_mention') else 'No' for post in posts],
+            'URL': [post.get('url', 'No URL') for post in posts]
+        })
+        event = st.dataframe(
+            compact_df,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row"
+        )
         
-        # Create an interactive table with expandable post content
-        for idx, row in df.iterrows():
-            with st.expander(f"📝 {row['Title']} - Sentiment: {row['Sentiment']}"):
-                col1, col2 = st.columns([1, 1])
-                
-                with col1:
-                    st.markdown(f"**Title:** {row['Title']}")
-                    st.markdown(f"**Sentiment:** {row['Sentiment']}")
-                    st.markdown(f"**Sentiment Score:** {row['Sentiment Score']}")
-                
-                with col2:
-                    st.markdown(f"**Audio Guide Mention:** {row['Audio Guide Mention']}")
-                    st.markdown(f"**URL:** [{row['URL']}]({row['URL']})")
-                
-                st.markdown("---")
-                st.markdown("**Content:**")
-                
-                # Highlight search terms if text search is active
-                content = row['Content']
-                if text_search and text_search.strip():
-                    search_term = text_search.lower().strip()
-                    if search_term in content.lower():
-                        # Simple highlighting by making the text bold where it matches
-                        highlighted_text = content.replace(
-                            search_term, f"**{search_term}**"
-                        )
-                        st.markdown(f"*{highlighted_text}*")
-                    else:
-                        st.markdown(f"*{content}*")
-                else:
-                    st.markdown(f"*{content}*")
-                
-                # Show replies if available
-                replies = posts[idx].get('replies', [])
-                if replies:
-                    st.markdown("**Replies:**")
-                    for reply in replies[:3]:  # Show first 3 replies
-                        st.markdown(f"- **{reply.get('author', 'Unknown')}**: {reply.get('content', 'No content')}")
-                    if len(replies) > 3:
-                        st.markdown(f"... and {len(replies) - 3} more replies")
-        
-        # Also show a compact table for quick reference
-        st.markdown("### 📊 Quick Reference Table")
-        st.markdown("Compact view for quick scanning.")
-        # Remove the content column for the compact view
-        compact_df = df.drop('Content', axis=1)
-        st.dataframe(compact_df, use_container_width=True)
+        selected_rows = [idx for idx in event.selection.rows if idx < len(posts)]
+        search_pattern = None
+        if text_search and text_search.strip():
+            search_pattern = re.compile(re.escape(text_search.strip()), re.IGNORECASE)
+        for idx in selected_rows:
+            post = posts[idx]
+            title = post.get('title', 'No Title')
+            sentiment = post.get('sentiment', 'neutral')
+            url = post.get('url', 'No URL')
+            st.markdown(f"#### 📝 {title} - Sentiment: {sentiment}")
+            col1, col2 = st.columns([1, 1])
+            
+            with col1:
+                st.markdown(f"**Title:** {title}")
+                st.markdown(f"**Sentiment:** {sentiment}")
+                st.markdown(f"**Sentiment Score:** {post.get('sentiment_score', 0):.3f}")
+            
+            with col2:
+                st.markdown(f"**Audio Guide Mention:** {'Yes' if post.get('audio_guide_mention') else 'No'}")
+                st.markdown(f"**URL:** [{url}]({url})")
+            
+            st.markdown("---")
+            st.markdown("**Content:**")
+            
+            # Highlight search terms if text search is active
+            content = post.get('content', 'No content available')
+            if search_pattern:
+                # Bold every case variant of the match
+                content = search_pattern.sub(r"**\g<0>**", content)
+            st.markdown(f"*{content}*")
+            
+            # Show replies if available
+            replies = post.get('replies', [])
+            if replies:
+                # Show first 3 replies in a single markdown block
+                replies_md = "\n".join(
+                    f"- **{reply.get('author', 'Unknown')}**: {reply.get('content', 'No content')}"
+                    for reply in replies[:3]
+                )
+                if len(replies) > 3:
+                    replies_md += f"\n\n... and {len(replies) - 3} more replies"
+                st.markdown(f"**Replies:**\n\n{replies_md}")
     
     def get_comparison_summary(self) -> None:
         """Display the comparison summary from the comparison data."""
@@ -411,36 +495,29 @@ class RickStevesDashboard:
         summary = self.comparison_data.get('summary', {})
         
         st.markdown("### 📊 Overall Summary")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Total Museums", summary.get('total_museums', 0))
-        
-        with col2:
-            st.metric("Total Posts", summary.get('total_posts', 0))
-        
-        with col3:
-            st.metric("Total Replies", summary.get('total_replies', 0))
-        
-        with col4:
-            st.metric("Audio Guide Mentions", summary.get('total_audio_guide_mentions', 0))
+        metrics = [
+            ("Total Museums", summary.get('total_museums', 0)),
+            ("Total Posts", summary.get('total_posts', 0)),
+            ("Total Replies", summary.get('total_replies', 0)),
+            ("Audio Guide Mentions", summary.get('total_audio_guide_mentions', 0))
+        ]
+        for col, (label, value) in zip(st.columns(4), metrics):
+            col.metric(label, value)
     
     def get_top_museums_by_engagement(self) -> None:
         """Display top museums by engagement."""
+        import plotly.express as px
+        
         if not self.comparison_data:
             return
         
-        top_museums = self.comparison_data.get('top_museums_by_engagement', [])
-        
-        if not top_museums:
+        if self.top_engagement_df.empty:
             return
         
         st.markdown("### 🏆 Top Museums by Engagement")
         
-        df = pd.DataFrame(top_museums)
-        
         fig = px.bar(
-            df,
+            self.top_engagement_df,
             x='museum',
             y='total_engagement',
             title="Top Museums by Total Engagement",
@@ -453,20 +530,18 @@ class RickStevesDashboard:
     
     def get_top_museums_by_sentiment(self) -> None:
         """Display top museums by sentiment."""
+        import plotly.express as px
+        
         if not self.comparison_data:
             return
         
-        top_museums = self.comparison_data.get('top_museums_by_sentiment', [])
-        
-        if not top_museums:
+        if self.top_sentiment_df.empty:
             return
         
         st.markdown("### 😊 Top Museums by Sentiment Score")
         
-        df = pd.DataFrame(top_museums)
-        
         fig = px.bar(
-            df,
+            self.top_sentiment_df,
             x='museum',
             y='sentiment_score',
             title="Top Museums by Sentiment Score",
@@ -479,23 +554,18 @@ class RickStevesDashboard:
     
     def get_theme_distribution(self) -> None:
         """Display theme distribution."""
+        import plotly.express as px
+        
         if not self.comparison_data:
             return
         
-        theme_dist = self.comparison_data.get('theme_distribution', {})
-        
-        if not theme_dist:
+        if self.theme_distribution_df.empty:
             return
         
         st.markdown("### 🏷️ Theme Distribution")
         
-        df = pd.DataFrame([
-            {'Theme': k, 'Count': v} 
-            for k, v in theme_dist.items()
-        ])
-        
         fig = px.bar(
-            df,
+            self.theme_distribution_df,
             x='Theme',
             y='Count',
             title="Theme Distribution Across All Museums",
@@ -522,34 +592,46 @@ class RickStevesDashboard:
         # Overall Summary
         if reactions_data.get('overall_summary'):
             st.markdown("#### 📋 Overall Summary / 전체 요약")
-            st.markdown(f"<div style='padding-bottom:4px'><b>EN:</b> {reactions_data['overall_summary']}</div>", unsafe_allow_html=True)
-            st.markdown(f"<div style='color:#2d8659'><b>KO:</b> {reactions_data.get('ko_overall_summary','')}</div>", unsafe_allow_html=True)
+            st.markdown(
+                f"<div style='padding-bottom:4px'><b>EN:</b> {reactions_data['overall_summary']}</div>"
+                f"<div style='color:#2d8659'><b>KO:</b> {reactions_data.get('ko_overall_summary','')}</div>",
+                unsafe_allow_html=True
+            )
             st.markdown("---")
         
-        # Positive Points
+        # Positive Points, emitted as one list per section
         if reactions_data.get('positive_points'):
             st.markdown("#### ✅ Positive Feedback / 긍정적 피드백")
-            for en, ko in zip(reactions_data['positive_points'], reactions_data.get('ko_positive_points', [])):
-                st.write(f"- **EN:** {en}")
-                st.write(f"  <span style='color:#2d8659'>• <b>KO:</b> {ko}</span>", unsafe_allow_html=True)
+            items = "\n".join(
+                f"- **EN:** {en}\n\n  <span style='color:#2d8659'>• <b>KO:</b> {ko}</span>"
+                for en, ko in zip(reactions_data['positive_points'], reactions_data.get('ko_positive_points', []))
+            )
+            st.markdown(items, unsafe_allow_html=True)
             st.markdown("---")
         
         # Negative Points
         if reactions_data.get('negative_points'):
             st.markdown("#### ❌ Negative Feedback / 부정적 피드백")
-            for en, ko in zip(reactions_data['negative_points'], reactions_data.get('ko_negative_points', [])):
-                st.write(f"- **EN:** {en}")
-                st.write(f"  <span style='color:#b22222'>• <b>KO:</b> {ko}</span>", unsafe_allow_html=True)
+            items = "\n".join(
+                f"- **EN:** {en}\n\n  <span style='color:#b22222'>• <b>KO:</b> {ko}</span>"
+                for en, ko in zip(reactions_data['negative_points'], reactions_data.get('ko_negative_points', []))
+            )
+            st.markdown(items, unsafe_allow_html=True)
             st.markdown("---")
         
         # Recommendation
         if reactions_data.get('recommendation'):
             st.markdown("#### 💡 Recommendation / 추천 및 조언")
-            st.markdown(f"<div style='padding-bottom:4px'><b>EN:</b> {reactions_data['recommendation']}</div>", unsafe_allow_html=True)
-            st.markdown(f"<div style='color:#2d8659'><b>KO:</b> {reactions_data.get('ko_recommendation','')}</div>", unsafe_allow_html=True)
+            st.markdown(
+                f"<div style='padding-bottom:4px'><b>EN:</b> {reactions_data['recommendation']}</div>"
+                f"<div style='color:#2d8659'><b>KO:</b> {reactions_data.get('ko_recommendation','')}</div>",
+                unsafe_allow_html=True
+            )
     
     def create_reactions_comparison(self) -> None:
         """Create a comparison of reactions across all museums."""
+        import plotly.express as px
+        
         if not hasattr(self, 'reactions_loader') or self.reactions_loader is None:
             st.info("No reactions data available for comparison.")
             return
@@ -561,24 +643,16 @@ class RickStevesDashboard:
         
         st.markdown("### 🏛️ Reactions Comparison Across Museums")
         
-        # Create comparison metrics
-        comparison_data = []
-        for museum_name, reactions in all_reactions.items():
-            positive_count = len(reactions.get('positive_points', []))
-            negative_count = len(reactions.get('negative_points', []))
-            total_points = positive_count + negative_count
-            
-            comparison_data.append({
-                'Museum': museum_name,
-                'Positive Points': positive_count,
-                'Negative Points': negative_count,
-                'Total Points': total_points,
-                'Positive Ratio': positive_count / max(1, total_points)
-            })
-        
-        if comparison_data:
-            df = pd.DataFrame(comparison_data)
-            
+        # Create comparison metrics: count points per museum, then derive totals column-wise
+        df = pd.DataFrame({
+            'Museum': list(all_reactions),
+            'Positive Points': [len(reactions.get('positive_points', [])) for reactions in all_reactions.values()],
+            'Negative Points': [len(reactions.get('negative_points', [])) for reactions in all_reactions.values()]
+        })
+        df['Total Points'] = df['Positive Points'] + df['Negative Points']
+        df['Positive Ratio'] = df['Positive Points'] / df['Total Points'].clip(lower=1)
+        
+        if not df.empty:
             # Create visualization
             col1, col2 = st.columns(2)
             
@@ -609,14 +683,66 @@ class RickStevesDashboard:
             st.markdown("#### 📊 Reactions Summary Table")
             st.dataframe(df, use_container_width=True)
     
-    def run(self) -> None:
-        """Run the main dashboard application."""
-        st.set_page_config(
-            page_title="Rick Steves Audio Guide Analysis",
-            page_icon="🎧",
-            layout="wide"
+    @st.fragment
+    def create_posts_section(self, selected_museum: str) -> None:
+        """Create the posts summary, filters and table; filter changes rerun only this fragment."""
+        posts = self.get_museum_posts(selected_museum)
+        post_indices = self.get_museum_post_indices(selected_museum)
+        scores = self._sentiment_scores[post_indices]
+        sentiment_codes = self._sentiment_codes[post_indices]
+        audio_mask = self._audio_mentions[post_indices]
+        
+        # Summary at the top
+        st.markdown("### 📊 Posts Summary")
+        total_posts = len(posts)
+        metrics = [
+            ("Total Posts", total_posts),
+            ("Audio Guide Mentions", int(audio_mask.sum())),
+            ("Positive Posts", int((sentiment_codes == SENTIMENT_LABELS.index('positive')).sum())),
+            ("Average Sentiment", f"{scores.sum() / max(1, total_posts):.3f}")
+        ]
+        for col, (label, value) in zip(st.columns(4), metrics):
+            col.metric(label, value)
+        
+        st.markdown("---")
+        
+        # Filter options
+        st.markdown("### 🔍 Filter Options")
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            show_audio_mentions = st.checkbox("Show only audio guide mentions", value=False)
+        
+        with col2:
+            sentiment_filter = st.selectbox(
+                "Sentiment filter",
+                ["All", "Positive", "Negative", "Neutral"]
+            )
+        
+        with col3:
+            min_sentiment = st.slider("Minimum sentiment score", -1.0, 1.0, -1.0, 0.1)
+        
+        with col4:
+            text_search = st.text_input("Search in post content", placeholder="Enter keywords...")
+        
+        # Apply filters; results are cached per combination of filter values
+        positions = _filter_post_positions(
+            self,
+            str(self.enhanced_posts_path),
+            self.enhanced_posts_mtime,
+            selected_museum,
+            show_audio_mentions,
+            sentiment_filter,
+            min_sentiment,
+            (text_search or "").lower().strip()
         )
+        filtered_posts = [posts[i] for i in positions]
         
+        st.markdown(f"**📋 Showing {len(filtered_posts)} of {len(posts)} posts**")
+        self.create_posts_table(filtered_posts, text_search)
+    
+    def run(self) -> None:
+        """Run the main dashboard application."""
         st.title("🎧 Rick Steves Audio Guide Analysis Dashboard")
         st.markdown("---")
         
@@ -692,7 +818,7 @@ class RickStevesDashboard:
             
             st.markdown("### Summary Statistics")
             if self.metrics_data:
-                summary_df = pd.DataFrame(self.metrics_data)
+                summary_df = self.metrics_df
                 st.dataframe(summary_df, use_container_width=True)
             return
         
@@ -721,23 +847,31 @@ class RickStevesDashboard:
             st.warning("Please select a museum from the sidebar or click a global analysis button.")
             return
         
-        # Main content area with museum-specific and global tabs
+        # Main content area with museum-specific and global sections.
+        # Only the active section runs, so hidden tabs don't build their charts.
         if selected_museum:
-            tab1, tab2, tab3, tab4 = st.tabs([
+            tab_labels = [
                 "📊 Overview", 
                 "🎯 Analysis", 
                 "📋 Posts",
                 "🎧 Reactions"
-            ])
+            ]
         else:
-            tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
+            tab_labels = [
                 "📊 Overview", 
                 "🎯 Analysis", 
                 "📋 Posts", 
                 "🏛️ Comparison",
                 "📈 Global Insights",
                 "🎧 Reactions"
-            ])
+            ]
+        active_tab = st.radio(
+            "Section",
+            tab_labels,
+            key="active_tab",
+            horizontal=True,
+            label_visibility="collapsed"
+        )
         
         # Get museum data for selected museum
         if selected_museum:
@@ -748,22 +882,21 @@ class RickStevesDashboard:
         
         # Museum-specific tabs (only shown when a museum is selected)
         if selected_museum:
-            with tab1:
+            if active_tab == tab_labels[0]:
                 st.header(f"Overview - {selected_museum}")
                 
                 self.create_overview_metrics(museum_data)
                 
                 st.markdown("### Key Insights")
-                total_reactions = museum_data['positive_reactions'] + museum_data['negative_reactions'] + museum_data['neutral_reactions']
                 st.markdown(f"""
                 - **Total Posts Analyzed:** {museum_data['total_posts']}
                 - **Total Replies:** {museum_data['total_replies']}
-                - **Total Reactions:** {total_reactions}
+                - **Total Reactions:** {museum_data['total_reactions']}
                 - **Overall Sentiment:** {'Positive' if museum_data['audio_guide_sentiment_score'] > 0.1 else 'Neutral' if museum_data['audio_guide_sentiment_score'] > -0.1 else 'Negative'}
                 - **Sentiment Score:** {museum_data['audio_guide_sentiment_score']:.3f}
                 """)
             
-            with tab2:
+            if active_tab == tab_labels[1]:
                 st.header(f"Analysis - {selected_museum}")
                 
                 col1, col2 = st.columns(2)
@@ -777,118 +910,51 @@ class RickStevesDashboard:
                 st.markdown("### Common Themes")
                 self.create_themes_chart(museum_data)
             
-            with tab3:
+            if active_tab == tab_labels[2]:
                 st.header(f"Posts - {selected_museum}")
                 
-                posts = self.get_museum_posts(selected_museum)
-                
-                # Summary at the top
-                st.markdown("### 📊 Posts Summary")
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    total_posts = len(posts)
-                    st.metric("Total Posts", total_posts)
-                
-                with col2:
-                    audio_mentions = len([p for p in posts if p.get('audio_guide_mention')])
-                    st.metric("Audio Guide Mentions", audio_mentions)
-                
-                with col3:
-                    positive_posts = len([p for p in posts if p.get('sentiment') == 'positive'])
-                    st.metric("Positive Posts", positive_posts)
-                
-                with col4:
-                    avg_sentiment = sum(p.get('sentiment_score', 0) for p in posts) / max(1, len(posts))
-                    st.metric("Average Sentiment", f"{avg_sentiment:.3f}")
-                
-                st.markdown("---")
-                
-                # Filter options
-                st.markdown("### 🔍 Filter Options")
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    show_audio_mentions = st.checkbox("Show only audio guide mentions", value=False)
-                
-                with col2:
-                    sentiment_filter = st.selectbox(
-                        "Sentiment filter",
-                        ["All", "Positive", "Negative", "Neutral"]
-                    )
-                
-                with col3:
-                    min_sentiment = st.slider("Minimum sentiment score", -1.0, 1.0, -1.0, 0.1)
-                
-                with col4:
-                    text_search = st.text_input("Search in post content", placeholder="Enter keywords...")
-                
-                # Apply filters
-                filtered_posts = posts
-                if show_audio_mentions:
-                    filtered_posts = [p for p in filtered_posts if p.get('audio_guide_mention')]
-                
-                filtered_posts = [p for p in filtered_posts if p.get('sentiment_score', 0) >= min_sentiment]
-                
-                if sentiment_filter != "All":
-                    filtered_posts = [p for p in filtered_posts if p.get('sentiment') == sentiment_filter.lower()]
-                
-                # Apply text search filter
-                if text_search and text_search.strip():
-                    search_term = text_search.lower().strip()
-                    filtered_posts = [
-                        p for p in filtered_posts 
-                        if search_term in (p.get('content', '') or '').lower() or search_term in (p.get('title', '') or '').lower()
-                    ]
-                
-                st.markdown(f"**📋 Showing {len(filtered_posts)} of {len(posts)} posts**")
-                self.create_posts_table(filtered_posts, text_search)
+                self.create_posts_section(selected_museum)
             
-            with tab4:
+            if active_tab == tab_labels[3]:
                 st.header(f"🎧 Reactions - {selected_museum}")
                 self.create_reactions_summary(selected_museum)
         
         # Global tabs (only shown when no museum is selected)
         else:
-            with tab1:
+            if active_tab == tab_labels[0]:
                 st.header("📊 Overview")
                 st.markdown("Please select a museum from the sidebar to view detailed analysis.")
                 
                 # Show some general statistics
                 if self.comparison_data:
                     summary = self.comparison_data.get('summary', {})
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Total Museums", summary.get('total_museums', 0))
-                    
-                    with col2:
-                        st.metric("Total Posts", summary.get('total_posts', 0))
-                    
-                    with col3:
-                        st.metric("Total Replies", summary.get('total_replies', 0))
-                    
-                    with col4:
-                        st.metric("Audio Guide Mentions", summary.get('total_audio_guide_mentions', 0))
+                    metrics = [
+                        ("Total Museums", summary.get('total_museums', 0)),
+                        ("Total Posts", summary.get('total_posts', 0)),
+                        ("Total Replies", summary.get('total_replies', 0)),
+                        ("Audio Guide Mentions", summary.get('total_audio_guide_mentions', 0))
+                    ]
+                    for col, (label, value) in zip(st.columns(4), metrics):
+                        col.metric(label, value)
             
-            with tab2:
+            if active_tab == tab_labels[1]:
                 st.header("🎯 Analysis")
                 st.markdown("Please select a museum from the sidebar to view detailed analysis.")
             
-            with tab3:
+            if active_tab == tab_labels[2]:
                 st.header("📋 Posts")
                 st.markdown("Please select a museum from the sidebar to view posts.")
             
-            with tab4:
+            if active_tab == tab_labels[3]:
                 st.header("🏛️ Comparison")
                 self.create_museum_comparison()
                 
                 st.markdown("### Summary Statistics")
                 if self.metrics_data:
-                    summary_df = pd.DataFrame(self.metrics_data)
+                    summary_df = self.metrics_df
                     st.dataframe(summary_df, use_container_width=True)
             
-            with tab5:
+            if active_tab == tab_labels[4]:
                 st.header("📈 Global Insights")
                 
                 self.get_comparison_summary()
@@ -903,62 +969,53 @@ class RickStevesDashboard:
                 
                 self.get_theme_distribution()
             
-            with tab6:
+            if active_tab == tab_labels[5]:
                 st.header("🎧 Reactions Analysis")
                 self.create_reactions_comparison()
 
 
+def _data_mtime(path: Path) -> float | None:
+    """Modification time of a data file, or None if it is missing."""
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _resolve_data_path(primary: Path, alternates: tuple[Path, ...]) -> Path:
+    """Return the primary path if it exists, else the first existing alternate."""
+    return primary if primary.exists() else next((alt for alt in alternates if alt.exists()), primary)
+
+
 def main():
     """Main function to run the dashboard."""
+    st.set_page_config(
+        page_title="Rick Steves Audio Guide Analysis",
+        page_icon="🎧",
+        layout="wide"
+    )
+    
     # Get the current script directory
     script_dir = Path(__file__).parent
     
-    # Define data file paths relative to the script directory
-    metrics_path = script_dir.parent / "transform" / "audio_guide_metrics.json"
-    comparison_path = script_dir.parent / "transform" / "museum_comparison.json"
-    enhanced_posts_path = script_dir.parent / "transform" / "enhanced_posts.json"
-    
-    # Check if files exist and provide fallback paths
-    if not metrics_path.exists():
-        # Try alternative paths for deployment
-        alt_paths = [
-            Path("src/transform/audio_guide_metrics.json"),
-            Path("transform/audio_guide_metrics.json"),
-            Path("audio_guide_metrics.json")
-        ]
-        for alt_path in alt_paths:
-            if alt_path.exists():
-                metrics_path = alt_path
-                break
-    
-    if not comparison_path.exists():
-        alt_paths = [
-            Path("src/transform/museum_comparison.json"),
-            Path("transform/museum_comparison.json"),
-            Path("museum_comparison.json")
-        ]
-        for alt_path in alt_paths:
-            if alt_path.exists():
-                comparison_path = alt_path
-                break
-    
-    if not enhanced_posts_path.exists():
-        alt_paths = [
-            Path("src/transform/enhanced_posts.json"),
-            Path("transform/enhanced_posts.json"),
-            Path("enhanced_posts.json")
-        ]
-        for alt_path in alt_paths:
-            if alt_path.exists():
-                enhanced_posts_path = alt_path
-                break
+    # Resolve data files relative to the script directory, falling back to
+    # alternative paths for deployment
+    transform_dir = script_dir.parent / "transform"
+    metrics_path, comparison_path, enhanced_posts_path = (
+        _resolve_data_path(
+            transform_dir / name,
+            (Path("src/transform") / name, Path("transform") / name, Path(name))
+        )
+        for name in ("audio_guide_metrics.json", "museum_comparison.json", "enhanced_posts.json")
+    )
     
     # Initialize dashboard with resolved paths
-    dashboard = RickStevesDashboard(
+    dashboard = get_dashboard(
         metrics_path=str(metrics_path),
         comparison_path=str(comparison_path),
         enhanced_posts_path=str(enhanced_posts_path),
-        reactions_dir="data"  # Look for reactions files in data directory
+        reactions_dir="data",  # Look for reactions files in data directory
+        data_mtimes=tuple(_data_mtime(path) for path in (metrics_path, comparison_path, enhanced_posts_path))
     )
     
     # Run dashboard
@@ -0,0 +1,39 @@
+"""
+JSON compatibility shim
+
+Picks the fastest available JSON parser (orjson, then ujson, then the stdlib)
+and exposes a single ``load_path`` helper for reading JSON files.
+"""
+
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+
+    JSONDecodeError = orjson.JSONDecodeError  # subclasses json.JSONDecodeError
+
+    def loads(data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+except ImportError:
+    try:
+        import ujson
+
+        JSONDecodeError = ujson.JSONDecodeError
+
+        def loads(data: bytes | str) -> Any:
+            return ujson.loads(data)
+
+    except ImportError:
+        import json
+
+        JSONDecodeError = json.JSONDecodeError
+
+        def loads(data: bytes | str) -> Any:
+            return json.loads(data)
+
+
+def load_path(path: str | Path) -> Any:
+    """Read and parse a JSON file in one go."""
+    return loads(Path(path).read_bytes())
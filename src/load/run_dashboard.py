@@ -6,7 +6,6 @@ This script runs the Streamlit dashboard application with the correct
 data file paths and configuration.
 """
 
-import subprocess
 import sys
 from pathlib import Path
 
@@ -47,22 +46,19 @@ def main():
     print(f"📋 Enhanced posts data: {enhanced_posts_file}")
     print("🌐 Opening dashboard in your browser...")
     
-    # Run the Streamlit dashboard
+    # Run the Streamlit dashboard in this process instead of spawning a new interpreter
     try:
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", str(dashboard_script),
-            "--server.port", "8502",
-            "--server.address", "0.0.0.0"
-        ], check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running dashboard: {e}")
+        from streamlit.web import bootstrap
+    except ImportError:
+        print("Error: Streamlit not found. Please install it with: pip install streamlit")
         sys.exit(1)
+    
+    flag_options = {"server_port": 8502, "server_address": "0.0.0.0"}
+    try:
+        bootstrap.load_config_options(flag_options)
+        bootstrap.run(str(dashboard_script), False, [], flag_options)
     except KeyboardInterrupt:
         print("\n👋 Dashboard stopped by user")
-    except FileNotFoundError:
-        print("Error: Streamlit not found. Please install it with: pip install streamlit")
-        sys.exit(1)
-
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
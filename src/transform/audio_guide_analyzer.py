@@ -5,12 +5,41 @@ This module processes Rick Steves forum data to analyze audio guide reactions
 and calculate various metrics for audio guide quality assessment across different museums.
 """
 
+import heapq
 import json
 import re
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from collections import Counter
 from datetime import datetime
+from itertools import chain
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+# Lowercase word tokens used for whole-word keyword matching
+WORD_RE = re.compile(r'[a-z]+')
+
+# Year patterns for post time strings
+YEAR_RE = re.compile(r'(\d{4})')
+YEARS_AGO_RE = re.compile(r'(\d+)\s+years? ago')
+
+
+def _covering_terms(terms: List[str]) -> Tuple[str, ...]:
+    """Terms that contain no other term, enough for an any-substring check"""
+    return tuple(term for term in terms if not any(other != term and other in term for other in terms))
+
+
+def write_json(data, output_file: str) -> None:
+    """Write data as indented UTF-8 JSON, serialized in one call by orjson when available"""
+    if orjson:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
 
 
 @dataclass
@@ -39,7 +68,7 @@ class RickStevesAudioGuideAnalyzer:
         'enjoy', 'informative', 'educational', 'clear', 'easy', 'convenient',
         'well-made', 'professional', 'comprehensive', 'detailed', 'insightful',
         'wonderful', 'outstanding', 'superb', 'brilliant', 'impressive',
-        'thank', 'thanks', 'helpful', 'good', 'nice', 'better', 'best'
+        'thank', 'thanks', 'nice', 'better', 'best'
     ]
     
     # Negative keywords related to audio guides
@@ -49,8 +78,8 @@ class RickStevesAudioGuideAnalyzer:
         'annoying', 'frustrating', 'broken', 'not working', 'missing',
         'outdated', 'poor', 'weak', 'limited', 'inadequate', 'overpriced',
         'expensive', 'rip-off', 'scam', 'trash', 'garbage', 'rubbish',
-        'disaster', 'nightmare', 'awful', 'dreadful', 'miserable', 'no',
-        'problem', 'issue', 'trouble', 'difficult', 'confusing'
+        'disaster', 'nightmare', 'dreadful', 'miserable', 'no',
+        'problem', 'issue', 'trouble'
     ]
     
     # Audio guide related terms
@@ -61,6 +90,17 @@ class RickStevesAudioGuideAnalyzer:
         'audio', 'guide', 'tour'
     ]
     
+    # Single-word sentiment keywords are matched as whole words; hyphenated and
+    # multi-word ones ('well-made', 'not working') as phrases
+    POSITIVE_WORDS = frozenset(word for word in POSITIVE_KEYWORDS if word.isalpha())
+    NEGATIVE_WORDS = frozenset(word for word in NEGATIVE_KEYWORDS if word.isalpha())
+    POSITIVE_PHRASES = tuple(word for word in POSITIVE_KEYWORDS if not word.isalpha())
+    NEGATIVE_PHRASES = tuple(word for word in NEGATIVE_KEYWORDS if not word.isalpha())
+    
+    # Audio guide terms that contain no shorter term; 'audio guide', 'guided tour'
+    # etc. can only match where 'audio', 'guide' or 'tour' already does
+    AUDIO_GUIDE_SCAN_TERMS = _covering_terms(AUDIO_GUIDE_TERMS)
+    
     # Museum name mappings for better categorization
     MUSEUM_MAPPINGS = {
         'prado': 'Museo del Prado',
@@ -91,11 +131,21 @@ class RickStevesAudioGuideAnalyzer:
     def __init__(self):
         self.data = []
         self.metrics = []
+        # Per-post results keyed by id() of the post/reply dict; each entry keeps
+        # its dict alive so the id cannot be reused while cached
+        self._museum_cache: Dict[int, Tuple[Dict, str]] = {}
+        self._sentiment_cache: Dict[int, Tuple[Dict, Tuple[str, float]]] = {}
     
     def load_data(self, file_path: str) -> None:
-        """Load Rick Steves forum data from JSON file"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+        """Load Rick Steves forum data from a JSON array or JSONL file"""
+        loads = orjson.loads if orjson else json.loads
+        with open(file_path, 'rb') as f:
+            if str(file_path).endswith('.jsonl'):
+                self.data = [loads(line) for line in f if line.strip()]
+            else:
+                self.data = loads(f.read())
+        self._museum_cache.clear()
+        self._sentiment_cache.clear()
     
     def extract_museum_name(self, title: str, content: str = "") -> str:
         """Extract museum name from post title and content"""
@@ -136,55 +186,85 @@ class RickStevesAudioGuideAnalyzer:
         
         return "Unknown Museum"
     
+    def _post_museum(self, post: Dict) -> str:
+        """Museum name of a post, extracted once per post"""
+        cached = self._museum_cache.get(id(post))
+        if cached is None:
+            cached = self._museum_cache[id(post)] = (post, self.extract_museum_name(
+                post.get('title', ''),
+                post.get('content', '')
+            ))
+        return cached[1]
+    
     def extract_audio_guide_mentions(self, text: str) -> bool:
         """Check if text mentions audio guide"""
         # Handle None values
         text = text or ""
-        text_lower = text.lower()
-        return any(term in text_lower for term in self.AUDIO_GUIDE_TERMS)
+        return self._mentions_audio_guide(text.lower())
     
-    def analyze_sentiment(self, text: str) -> str:
-        """Analyze sentiment of audio guide mentions"""
-        # Handle None values
-        text = text or ""
-        text_lower = text.lower()
-        
-        positive_count = sum(1 for word in self.POSITIVE_KEYWORDS if word in text_lower)
-        negative_count = sum(1 for word in self.NEGATIVE_KEYWORDS if word in text_lower)
-        
-        if positive_count > negative_count:
-            return 'positive'
-        elif negative_count > positive_count:
-            return 'negative'
-        else:
-            return 'neutral'
+    def _mentions_audio_guide(self, text_lower: str) -> bool:
+        """Check if already lowercased text mentions audio guide"""
+        return any(term in text_lower for term in self.AUDIO_GUIDE_SCAN_TERMS)
     
-    def calculate_sentiment_score(self, text: str) -> float:
-        """Calculate detailed sentiment score for a single post/reply"""
+    def _count_keywords(self, text_lower: str) -> Tuple[int, int]:
+        """Count positive and negative keywords found in lowercased text"""
+        words = set(WORD_RE.findall(text_lower))
+        positive_count = len(self.POSITIVE_WORDS.intersection(words))
+        positive_count += sum(1 for phrase in self.POSITIVE_PHRASES if phrase in text_lower)
+        negative_count = len(self.NEGATIVE_WORDS.intersection(words))
+        negative_count += sum(1 for phrase in self.NEGATIVE_PHRASES if phrase in text_lower)
+        return positive_count, negative_count
+    
+    def analyze_text_sentiment(self, text: str) -> Tuple[str, float]:
+        """Return the sentiment label and score of a text from a single keyword scan"""
         # Handle None values
         text = text or ""
-        text_lower = text.lower()
-        
-        # Count positive and negative keywords
-        positive_count = sum(1 for word in self.POSITIVE_KEYWORDS if word in text_lower)
-        negative_count = sum(1 for word in self.NEGATIVE_KEYWORDS if word in text_lower)
+        return self._analyze_lower_sentiment(text.lower())
+    
+    def _analyze_lower_sentiment(self, text_lower: str) -> Tuple[str, float]:
+        """Sentiment label and score of already lowercased text"""
+        positive_count, negative_count = self._count_keywords(text_lower)
         
         # Calculate base score
         if positive_count > negative_count:
-            base_score = 1.0
+            sentiment, base_score = 'positive', 1.0
         elif negative_count > positive_count:
-            base_score = -1.0
+            sentiment, base_score = 'negative', -1.0
         else:
-            base_score = 0.0
+            sentiment, base_score = 'neutral', 0.0
         
         # Normalize by text length to avoid bias towards longer texts
-        text_length = len(text.split())
+        text_length = len(text_lower.split())
         if text_length > 0:
             normalized_score = base_score / (text_length ** 0.5)
         else:
             normalized_score = base_score
         
-        return normalized_score
+        return sentiment, normalized_score
+    
+    def _item_sentiment(self, item: Dict, text_lower: str) -> Tuple[str, float]:
+        """Sentiment of a post or reply's lowercased text, analyzed once per item"""
+        cached = self._sentiment_cache.get(id(item))
+        if cached is None:
+            cached = self._sentiment_cache[id(item)] = (item, self._analyze_lower_sentiment(text_lower))
+        return cached[1]
+    
+    def analyze_sentiment(self, text: str) -> str:
+        """Analyze sentiment of audio guide mentions"""
+        # Handle None values
+        text = text or ""
+        positive_count, negative_count = self._count_keywords(text.lower())
+        
+        if positive_count > negative_count:
+            return 'positive'
+        elif negative_count > positive_count:
+            return 'negative'
+        else:
+            return 'neutral'
+    
+    def calculate_sentiment_score(self, text: str) -> float:
+        """Calculate detailed sentiment score for a single post/reply"""
+        return self.analyze_text_sentiment(text)[1]
     
     def extract_common_themes(self, posts: List[Dict]) -> List[str]:
         """Extract common themes from audio guide mentions"""
@@ -195,16 +275,15 @@ class RickStevesAudioGuideAnalyzer:
             content = post.get('content', '')
             replies = post.get('replies', [])
             
-            # Check main post title and content
-            if self.extract_audio_guide_mentions(title) or self.extract_audio_guide_mentions(content):
-                text = f"{title} {content}".lower()
+            # Check main post title and content with one scan of the combined text
+            text = f"{title} {content}".lower()
+            if self._mentions_audio_guide(text):
                 self._extract_themes_from_text(text, themes)
             
             # Check reply content
             for reply in replies:
-                reply_content = reply.get('content', '')
-                if self.extract_audio_guide_mentions(reply_content):
-                    text = reply_content.lower()
+                text = (reply.get('content', '') or "").lower()
+                if self._mentions_audio_guide(text):
                     self._extract_themes_from_text(text, themes)
         
         # Return most common themes
@@ -244,52 +323,50 @@ class RickStevesAudioGuideAnalyzer:
     
     def extract_user_engagement(self, posts: List[Dict]) -> Dict[str, int]:
         """Extract user engagement metrics"""
-        user_posts = Counter()
-        user_replies = Counter()
+        # Posts and replies count toward the same per-user total
+        engagement = Counter()
         
         for post in posts:
             # Count main posts (assuming they have an author field)
             if 'author' in post:
-                user_posts[post['author']] += 1
+                engagement[post['author']] += 1
             
             # Count replies
-            replies = post.get('replies', [])
-            for reply in replies:
-                author = reply.get('author', 'Unknown')
-                user_replies[author] += 1
+            engagement.update(reply.get('author', 'Unknown') for reply in post.get('replies', []))
         
-        # Combine post and reply counts
-        total_engagement = {}
-        for user in set(user_posts.keys()) | set(user_replies.keys()):
-            total_engagement[user] = user_posts[user] + user_replies[user]
-        
-        return dict(total_engagement)
+        return dict(engagement)
     
     def extract_time_distribution(self, posts: List[Dict]) -> Dict[str, int]:
         """Extract time distribution of posts"""
         time_distribution = Counter()
         
         for post in posts:
-            time_str = post.get('time', '')
-            if time_str:
-                # Extract year from time string
-                year_match = re.search(r'(\d{4})', time_str)
-                if year_match:
-                    year = year_match.group(1)
-                    time_distribution[year] += 1
-                else:
-                    # Handle relative time strings
-                    if 'years ago' in time_str:
-                        # Extract number of years
-                        years_match = re.search(r'(\d+)\s+years? ago', time_str)
-                        if years_match:
-                            years_ago = int(years_match.group(1))
-                            # Estimate year (assuming current year is 2024)
-                            estimated_year = 2024 - years_ago
-                            time_distribution[str(estimated_year)] += 1
+            year = self._extract_year(post.get('time', ''))
+            if year:
+                time_distribution[year] += 1
         
         return dict(time_distribution)
     
+    def _extract_year(self, time_str: str) -> Optional[str]:
+        """Extract the year of a post from its time string"""
+        if time_str:
+            # Dated strings usually lead with the year; skip the regex for those
+            if time_str[:4].isdecimal():
+                return time_str[:4]
+            # Extract year from time string
+            year_match = YEAR_RE.search(time_str)
+            if year_match:
+                return year_match.group(1)
+            # Handle relative time strings
+            if 'years ago' in time_str:
+                # Extract number of years
+                years_match = YEARS_AGO_RE.search(time_str)
+                if years_match:
+                    years_ago = int(years_match.group(1))
+                    # Estimate year (assuming current year is 2024)
+                    return str(2024 - years_ago)
+        return None
+    
     def process_museum_data(self, museum_posts: List[Dict]) -> AudioGuideMetrics:
         """Process individual museum data and return metrics"""
         if not museum_posts:
@@ -309,24 +386,36 @@ class RickStevesAudioGuideAnalyzer:
         
         # Calculate basic metrics
         total_posts = len(museum_posts)
-        total_replies = sum(len(post.get('replies', [])) for post in museum_posts)
+        total_replies = 0
         
-        # Analyze sentiment based on titles and content
+        # Sentiment, themes, engagement and time distribution are all gathered
+        # in a single pass over the posts and their replies
         positive_count = 0
         negative_count = 0
         neutral_count = 0
         total_sentiment_score = 0.0
         sentiment_count = 0
+        themes = []
+        user_engagement = Counter()
+        time_distribution = Counter()
         
         for post in museum_posts:
             title = post.get('title', '')
             content = post.get('content', '')
             replies = post.get('replies', [])
+            total_replies += len(replies)
+            
+            if 'author' in post:
+                user_engagement[post['author']] += 1
+            
+            year = self._extract_year(post.get('time', ''))
+            if year:
+                time_distribution[year] += 1
             
-            # Analyze main post title and content
-            if self.extract_audio_guide_mentions(title) or self.extract_audio_guide_mentions(content):
-                combined_text = f"{title} {content}"
-                sentiment = self.analyze_sentiment(combined_text)
+            # Analyze main post title and content, lowercased once for every check
+            text_lower = f"{title} {content}".lower()
+            if self._mentions_audio_guide(text_lower):
+                sentiment, score = self._item_sentiment(post, text_lower)
                 if sentiment == 'positive':
                     positive_count += 1
                 elif sentiment == 'negative':
@@ -334,15 +423,16 @@ class RickStevesAudioGuideAnalyzer:
                 else:
                     neutral_count += 1
                 
-                score = self.calculate_sentiment_score(combined_text)
                 total_sentiment_score += score
                 sentiment_count += 1
+                self._extract_themes_from_text(text_lower, themes)
             
             # Analyze replies
+            user_engagement.update(reply.get('author', 'Unknown') for reply in replies)
             for reply in replies:
-                reply_content = reply.get('content', '')
-                if self.extract_audio_guide_mentions(reply_content):
-                    sentiment = self.analyze_sentiment(reply_content)
+                reply_lower = (reply.get('content', '') or "").lower()
+                if self._mentions_audio_guide(reply_lower):
+                    sentiment, score = self._item_sentiment(reply, reply_lower)
                     if sentiment == 'positive':
                         positive_count += 1
                     elif sentiment == 'negative':
@@ -350,26 +440,21 @@ class RickStevesAudioGuideAnalyzer:
                     else:
                         neutral_count += 1
                     
-                    score = self.calculate_sentiment_score(reply_content)
                     total_sentiment_score += score
                     sentiment_count += 1
+                    self._extract_themes_from_text(reply_lower, themes)
         
         # Calculate average sentiment score
         avg_sentiment_score = total_sentiment_score / sentiment_count if sentiment_count > 0 else 0.0
         
-        # Extract additional metrics
-        common_themes = self.extract_common_themes(museum_posts)
-        user_engagement = self.extract_user_engagement(museum_posts)
-        time_distribution = self.extract_time_distribution(museum_posts)
+        # Most common themes, as in extract_common_themes
+        common_themes = [theme for theme, count in Counter(themes).most_common(10)]
         
         # Get forum from first post
         forum = museum_posts[0].get('forum', 'Unknown') if museum_posts else 'Unknown'
         
         # Get museum name from first post
-        museum_name = self.extract_museum_name(
-            museum_posts[0].get('title', ''),
-            museum_posts[0].get('content', '')
-        ) if museum_posts else 'Unknown'
+        museum_name = self._post_museum(museum_posts[0]) if museum_posts else 'Unknown'
         
         return AudioGuideMetrics(
             museum=museum_name,
@@ -381,8 +466,8 @@ class RickStevesAudioGuideAnalyzer:
             neutral_reactions=neutral_count,
             audio_guide_sentiment_score=avg_sentiment_score,
             common_themes=common_themes,
-            user_engagement=user_engagement,
-            time_distribution=time_distribution
+            user_engagement=dict(user_engagement),
+            time_distribution=dict(time_distribution)
         )
     
     def group_posts_by_museum(self) -> Dict[str, List[Dict]]:
@@ -390,10 +475,7 @@ class RickStevesAudioGuideAnalyzer:
         museum_groups = {}
         
         for post in self.data:
-            museum_name = self.extract_museum_name(
-                post.get('title', ''),
-                post.get('content', '')
-            )
+            museum_name = self._post_museum(post)
             
             if museum_name not in museum_groups:
                 museum_groups[museum_name] = []
@@ -435,58 +517,43 @@ class RickStevesAudioGuideAnalyzer:
                 'time_distribution': metric.time_distribution
             })
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(metrics_data, f, indent=2, ensure_ascii=False, default=str)
+        write_json(metrics_data, output_file)
     
     def create_enhanced_posts_data(self) -> List[Dict]:
-        """Create enhanced posts data with sentiment analysis"""
-        enhanced_data = []
-        
+        """Create enhanced posts data with sentiment analysis, annotating the loaded posts in place"""
         for post in self.data:
-            enhanced_post = post.copy()
-            
             # Add sentiment analysis to main post
             title = post.get('title', '')
             content = post.get('content', '')
-            combined_text = f"{title} {content}"
+            combined_lower = f"{title} {content}".lower()
             
-            if self.extract_audio_guide_mentions(combined_text):
-                enhanced_post['audio_guide_mention'] = True
-                enhanced_post['sentiment'] = self.analyze_sentiment(combined_text)
-                enhanced_post['sentiment_score'] = self.calculate_sentiment_score(combined_text)
+            if self._mentions_audio_guide(combined_lower):
+                post['audio_guide_mention'] = True
+                post['sentiment'], post['sentiment_score'] = self._item_sentiment(post, combined_lower)
             else:
-                enhanced_post['audio_guide_mention'] = False
-                enhanced_post['sentiment'] = 'neutral'
-                enhanced_post['sentiment_score'] = 0.0
+                post['audio_guide_mention'] = False
+                post['sentiment'] = 'neutral'
+                post['sentiment_score'] = 0.0
             
             # Add sentiment analysis to replies
-            enhanced_replies = []
-            for reply in post.get('replies', []):
-                enhanced_reply = reply.copy()
-                reply_content = reply.get('content', '')
+            for reply in post.setdefault('replies', []):
+                reply_lower = (reply.get('content', '') or "").lower()
                 
-                if self.extract_audio_guide_mentions(reply_content):
-                    enhanced_reply['audio_guide_mention'] = True
-                    enhanced_reply['sentiment'] = self.analyze_sentiment(reply_content)
-                    enhanced_reply['sentiment_score'] = self.calculate_sentiment_score(reply_content)
+                if self._mentions_audio_guide(reply_lower):
+                    reply['audio_guide_mention'] = True
+                    reply['sentiment'], reply['sentiment_score'] = self._item_sentiment(reply, reply_lower)
                 else:
-                    enhanced_reply['audio_guide_mention'] = False
-                    enhanced_reply['sentiment'] = 'neutral'
-                    enhanced_reply['sentiment_score'] = 0.0
-                
-                enhanced_replies.append(enhanced_reply)
-            
-            enhanced_post['replies'] = enhanced_replies
-            enhanced_data.append(enhanced_post)
+                    reply['audio_guide_mention'] = False
+                    reply['sentiment'] = 'neutral'
+                    reply['sentiment_score'] = 0.0
         
-        return enhanced_data
+        return self.data
     
     def save_enhanced_posts(self, output_file: str) -> None:
         """Save enhanced posts data with sentiment analysis"""
         enhanced_data = self.create_enhanced_posts_data()
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(enhanced_data, f, indent=2, ensure_ascii=False, default=str)
+        write_json(enhanced_data, output_file)
     
     def get_museum_comparison(self) -> Dict:
         """Generate museum comparison data"""
@@ -510,11 +577,11 @@ class RickStevesAudioGuideAnalyzer:
             'time_trends': {}
         }
         
-        # Top museums by engagement
-        sorted_by_engagement = sorted(
+        # Top museums by engagement; nlargest keeps sorted()'s order for ties
+        top_by_engagement = heapq.nlargest(
+            10,
             self.metrics, 
-            key=lambda x: x.total_posts + x.total_replies, 
-            reverse=True
+            key=lambda x: x.total_posts + x.total_replies
         )
         comparison['top_museums_by_engagement'] = [
             {
@@ -524,14 +591,14 @@ class RickStevesAudioGuideAnalyzer:
                 'total_replies': m.total_replies,
                 'total_engagement': m.total_posts + m.total_replies
             }
-            for m in sorted_by_engagement[:10]
+            for m in top_by_engagement
         ]
         
         # Top museums by sentiment
-        sorted_by_sentiment = sorted(
+        top_by_sentiment = heapq.nlargest(
+            10,
             self.metrics, 
-            key=lambda x: x.audio_guide_sentiment_score, 
-            reverse=True
+            key=lambda x: x.audio_guide_sentiment_score
         )
         comparison['top_museums_by_sentiment'] = [
             {
@@ -541,7 +608,7 @@ class RickStevesAudioGuideAnalyzer:
                 'positive_reactions': m.positive_reactions,
                 'negative_reactions': m.negative_reactions
             }
-            for m in sorted_by_sentiment[:10]
+            for m in top_by_sentiment
         ]
         
         # Forum distribution
@@ -549,19 +616,13 @@ class RickStevesAudioGuideAnalyzer:
         comparison['forum_distribution'] = dict(forum_counts)
         
         # Theme distribution
-        all_themes = []
-        for m in self.metrics:
-            all_themes.extend(m.common_themes)
-        theme_counts = Counter(all_themes)
+        theme_counts = Counter(chain.from_iterable(m.common_themes for m in self.metrics))
         comparison['theme_distribution'] = dict(theme_counts)
         
         # Time trends
-        all_time_distributions = {}
+        time_trends = Counter()
         for m in self.metrics:
-            for year, count in m.time_distribution.items():
-                if year not in all_time_distributions:
-                    all_time_distributions[year] = 0
-                all_time_distributions[year] += count
-        comparison['time_trends'] = all_time_distributions
+            time_trends.update(m.time_distribution)
+        comparison['time_trends'] = dict(time_trends)
         
         return comparison 
\ No newline at end of file
@@ -5,17 +5,21 @@ This script loads the Rick Steves forum data and performs audio guide analysis,
 generating metrics and insights about audio guide reactions across different museums.
 """
 
-import json
 import sys
+from collections import Counter
+from itertools import chain
 from pathlib import Path
-from audio_guide_analyzer import RickStevesAudioGuideAnalyzer
+from audio_guide_analyzer import RickStevesAudioGuideAnalyzer, write_json
 
 
 def main():
     """Main function to run the transform process"""
     
     # Input and output file paths
-    input_file = Path("../../data/posts_audio_guide_detail.json")
+    input_file = Path("../../data/posts_audio_guide_detail.jsonl")
+    if not input_file.exists():
+        # Fall back to the JSON array written by earlier scraper runs
+        input_file = Path("../../data/posts_audio_guide_detail.json")
     output_file = Path("audio_guide_metrics.json")
     comparison_file = Path("museum_comparison.json")
     enhanced_posts_file = Path("enhanced_posts.json")
@@ -50,8 +54,7 @@ def main():
         print("Generating museum comparison...")
         comparison = analyzer.get_museum_comparison()
         
-        with open(comparison_file, 'w', encoding='utf-8') as f:
-            json.dump(comparison, f, indent=2, ensure_ascii=False, default=str)
+        write_json(comparison, comparison_file)
         
         # Print summary
         print("\n=== Analysis Summary ===")
@@ -87,28 +90,15 @@ def main():
             print(f"{i}. {metric.museum} ({metric.forum}): {total_reactions} reactions")
         
         print("\n=== Forum Distribution ===")
-        forum_counts = {}
-        for metric in metrics:
-            forum = metric.forum
-            if forum not in forum_counts:
-                forum_counts[forum] = 0
-            forum_counts[forum] += 1
-        
-        for forum, count in sorted(forum_counts.items(), key=lambda x: x[1], reverse=True):
+        forum_counts = Counter(metric.forum for metric in metrics)
+        
+        for forum, count in forum_counts.most_common():
             print(f"{forum}: {count} museums")
         
         print("\n=== Common Themes ===")
-        all_themes = []
-        for metric in metrics:
-            all_themes.extend(metric.common_themes)
-        
-        theme_counts = {}
-        for theme in all_themes:
-            if theme not in theme_counts:
-                theme_counts[theme] = 0
-            theme_counts[theme] += 1
+        theme_counts = Counter(chain.from_iterable(metric.common_themes for metric in metrics))
         
-        for theme, count in sorted(theme_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for theme, count in theme_counts.most_common(10):
             print(f"{theme}: {count} mentions")
         
         print(f"\nResults saved to:")